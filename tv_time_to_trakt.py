@@ -1,13 +1,41 @@
-import requests
+import asyncio
+import aiohttp
 import re
 import json
 from tqdm import tqdm
 import colorama
 from colorama import Fore, Style
-from datetime import datetime
 import urllib.parse
 import csv
 import sys
+import os
+import tempfile
+import time
+from email.utils import parsedate_to_datetime
+
+# orjson is optional: it's a lot faster at reading/writing JSON, but the standard json module works too
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# google-re2 is optional too: its linear-time engine scans the big TVTime/IMDb pages faster than re
+try:
+    import re2 as page_re
+except ImportError:
+    page_re = re
+
+# lxml is optional as well: if it's installed, the IMDb search results are parsed as HTML
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# pandas is optional, too: its C parser reads big CSV exports a lot faster than the csv module
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 # Initialize colorama (especially important on Windows)
 colorama.init()
@@ -20,19 +48,183 @@ HEADERS = {
         "Chrome/100.0.4896.60 Safari/537.36"
     )
 }
+# No explicit Accept-Encoding: aiohttp already asks for gzip/deflate, plus Brotli if the
+# 'brotli' package is installed, which are exactly the encodings it can decode
+
+# URL prefixes of TVTime movie pages, the IMDb title search and IMDb title pages
+TVTIME_MOVIE_PREFIX = "https://www.tvtime.com/movie/"
+IMDB_SEARCH_PREFIX = "https://www.imdb.com/find?s=tt&q="
+IMDB_TITLE_PREFIX = "https://www.imdb.com/title/"
+
+# Maximum number of open connections (TVTime + IMDb), and per host
+POOL_SIZE = 64
+POOL_SIZE_PER_HOST = 32
+# How long resolved host names are cached, in seconds
+DNS_CACHE_TTL = 300
+# Number of TVTime pages fetched concurrently, and of IMDb searches (IMDb rate-limits a lot sooner)
+MAX_CONCURRENT_TVTIME_FETCHES = 32
+MAX_CONCURRENT_IMDB_SEARCHES = 4
+# Timeout in seconds for a single request
+REQUEST_TIMEOUT = 10
+
+# Failed requests (connection errors or one of these status codes) are retried RETRY_TOTAL times,
+# waiting RETRY_BACKOFF_FACTOR * 2^(retry number - 1) seconds between tries, or as long as the
+# server's Retry-After header says (up to RETRY_AFTER_MAX seconds)
+RETRY_TOTAL = 4
+RETRY_BACKOFF_FACTOR = 0.4
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_AFTER_MAX = 60
+
+# Matches imdb_id":"tt#### in the raw bytes of TVTime pages (with or without escaped quotes)
+_IMDB_ID_BYTES = page_re.compile(rb'imdb_id\\?":\\?"(tt\d+)\\?"')
+# Matches IMDb title links on the search page, e.g. /title/tt0372784/?ref_=fn_tt_tt_1
+_IMDB_TITLE_HREF = page_re.compile(rb'/title/(tt\d+)/')
+# Same as _IMDB_TITLE_HREF, but for an already extracted href (str)
+_IMDB_TITLE_PATH = re.compile(r'/title/(tt\d+)')
+
+# TV Time's 'created_at' format, e.g. 2020-09-21 02:17:20
+_CREATED_AT = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+
+# The CSV columns this script actually uses
+CSV_COLUMNS = ['entity_type', 'uuid', 'movie_name', 'type-uuid-n', 'created_at']
+
+# Movie names that can never give a useful IMDb search result
+_JUNK_MOVIE_NAMES = {'(no title)', 'n/a'}
+
+# IMDb IDs found in previous runs are stored here, so re-runs don't have to fetch them again
+CACHE_FILE = ".imdb_cache.json"
+
+
+def create_session():
+    """
+    Creates an aiohttp.ClientSession with our default headers and a pooled connector,
+    so every fetch reuses already-open (and already TLS-handshaked) connections.
+    Has to be called from within a running event loop.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=POOL_SIZE,
+            limit_per_host=POOL_SIZE_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL
+        ),
+        headers=HEADERS,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    )
 
 
-def csv_to_json(csv_file_path, json_file_path):
+def parse_retry_after(value):
     """
-    Converts a CSV file to a JSON file. Assumes the first row of the CSV
-    file contains column headers. Writes the resulting list of dicts to 'json_file_path'.
+    Parses a Retry-After header 'value' (either seconds or an HTTP date) and returns
+    how many seconds to wait, capped at RETRY_AFTER_MAX. Returns None if 'value' is missing or invalid.
     """
-    data_list = []
+    if not value:
+        return None
     try:
-        with open(csv_file_path, mode='r', encoding='utf-8-sig') as csv_file:
-            reader = csv.DictReader(csv_file)
-            for row in reader:
-                data_list.append(row)
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), RETRY_AFTER_MAX)
+
+
+async def get_with_retries(session, url):
+    """
+    Sends a GET request for 'url', retrying on connection errors and RETRY_STATUSES.
+    Between tries it backs off exponentially, or waits as long as the server asks for via Retry-After.
+    Returns the aiohttp.ClientResponse of the last try, which the caller has to release
+    (e.g. via 'async with'). Raises the last error if every try failed to connect.
+    """
+    retry_after = None
+    for retry in range(RETRY_TOTAL + 1):
+        if retry:
+            if retry_after is None:
+                retry_after = RETRY_BACKOFF_FACTOR * (2 ** (retry - 1))
+            await asyncio.sleep(retry_after)
+        retry_after = None
+        try:
+            response = await session.get(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if retry == RETRY_TOTAL:
+                raise
+            continue
+        if response.status not in RETRY_STATUSES or retry == RETRY_TOTAL:
+            return response
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        response.release()
+
+
+def dumps_json(obj, indent=False):
+    """
+    Serializes 'obj' to UTF-8 encoded JSON bytes (non-ASCII characters are not escaped),
+    using orjson if it's installed. If 'indent' is True, the output is indented by 2 spaces.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(data):
+    """
+    Parses JSON 'data' (bytes or str), using orjson if it's installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_cache(cache_file):
+    """
+    Loads the IMDb ID cache from 'cache_file'. Returns a dict with a "tvtime" (uuid -> IMDb ID)
+    and a "search" (lowercased movie name -> IMDb ID) mapping, both empty if there's no usable cache.
+    """
+    cache = {"tvtime": {}, "search": {}}
+    try:
+        with open(cache_file, 'rb') as f:
+            loaded = loads_json(f.read())
+        cache["tvtime"].update(loaded.get("tvtime", {}))
+        cache["search"].update(loaded.get("search", {}))
+    except FileNotFoundError:
+        pass
+    except (ValueError, AttributeError, TypeError) as e:
+        cache = {"tvtime": {}, "search": {}}
+        print(f"Warning: Ignoring unreadable cache file '{cache_file}': {e}")
+    return cache
+
+
+def save_cache(cache, cache_file):
+    """
+    Atomically writes the IMDb ID cache to 'cache_file' (via a temp file + os.replace),
+    so an interrupted run never leaves a half-written cache behind.
+    """
+    cache_dir = os.path.dirname(os.path.abspath(cache_file))
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=".imdb_cache_", suffix=".tmp")
+    except OSError as e:
+        print(f"Warning: Could not write cache file '{cache_file}': {e}")
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps_json(cache))
+        os.replace(temp_path, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write cache file '{cache_file}': {e}")
+        # Don't leave the temp file behind
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def iter_csv_rows(csv_file_path):
+    """
+    Lazily yields the rows of a CSV file as dicts. Assumes the first row of the CSV
+    file contains column headers.
+    """
+    try:
+        with open(csv_file_path, mode='r', encoding='utf-8-sig', newline='') as csv_file:
+            yield from csv.DictReader(csv_file)
     except FileNotFoundError:
         print(f"Error: CSV file '{csv_file_path}' does not exist.")
         sys.exit(1)
@@ -40,63 +232,86 @@ def csv_to_json(csv_file_path, json_file_path):
         print(f"Error reading CSV file: {e}")
         sys.exit(1)
 
-    # Write to JSON file
-    try:
-        with open(json_file_path, mode='w', encoding='utf-8') as json_file:
-            json.dump(data_list, json_file, indent=2, ensure_ascii=False)
-        print(f"Success: CSV '{csv_file_path}' converted to '{json_file_path}'.")
-    except IOError as e:
-        print(f"Error writing to JSON file: {e}")
-        sys.exit(1)
+
+async def search_response_body(response, pattern):
+    """
+    Reads the whole body of 'response' and scans its raw bytes for 'pattern', returning the
+    first capture group as str, or None if the page doesn't contain it.
+    The body is always read completely, so the connection can go back into the pool.
+    """
+    match = pattern.search(await response.read())
+    return match.group(1).decode('ascii') if match else None
 
 
-def get_first_imdb_id(page_source):
+def find_first_title_link(page_content):
     """
-    Given an HTML page source (as plain text), find the first occurrence
-    of imdb_id":"tt#### (with or without escaped quotes) and return it (e.g., "tt0081505").
-    If not found, return None.
+    Parses the IMDb search page 'page_content' (bytes) with lxml and returns the
+    IMDb ID of the first link to a title, or None if there is no such link
+    (or the page can't be parsed, e.g. because it contains no elements at all).
     """
-    pattern = r'\\"imdb_id\\":\\"(tt\d+)\\"|imdb_id":"(tt\d+)"'
-    match = re.search(pattern, page_source)
-    if match:
-        return match.group(1) if match.group(1) else match.group(2)
-    else:
+    try:
+        tree = lxml_html.fromstring(page_content)
+    except lxml_etree.LxmlError:
         return None
+    hrefs = tree.xpath('(//a[contains(@href, "/title/tt")])[1]/@href')
+    match = _IMDB_TITLE_PATH.search(hrefs[0]) if hrefs else None
+    return match.group(1) if match else None
+
+
+def is_searchable_movie_name(movie_name):
+    """
+    Returns False if 'movie_name' is empty, a placeholder like '(no title)' or only punctuation,
+    i.e. searching IMDb for it would just waste a request. One-character titles like 'M' are fine.
+    """
+    name = (movie_name or '').strip()
+    if name.lower() in _JUNK_MOVIE_NAMES:
+        return False
+    return any(c.isalnum() for c in name)
 
 
-def get_imdb_id_by_search(movie_name):
+async def get_imdb_id_by_search(movie_name, session=None, log=None):
     """
     Fallback: search IMDb by the movie name.
     Returns the first 'tt####' ID found, or None if not found.
+    Uses 'session' for the request if given, otherwise a new session just for this search.
+    Messages are appended to the list 'log' if given, otherwise written right away.
     """
-    movie_name_encoded = urllib.parse.quote_plus(movie_name)
-    search_url = f"https://www.imdb.com/find?q={movie_name_encoded}&s=tt"
+    write = log.append if log is not None else tqdm.write
+    if not is_searchable_movie_name(movie_name):
+        write(f"{Fore.RED}Skipped IMDB search for unusable movie name '{movie_name}'{Style.RESET_ALL}")
+        return None
+
+    if session is None:
+        async with create_session() as own_session:
+            return await get_imdb_id_by_search(movie_name, session=own_session, log=log)
+
+    search_url = IMDB_SEARCH_PREFIX + urllib.parse.quote_plus(movie_name)
 
     try:
-        response = requests.get(search_url, timeout=10, headers=HEADERS)
-        if response.status_code == 200:
-            # Example snippet: /title/tt0372784/?ref_=fn_tt_tt_1
-            pattern = r'/title/(tt\d+)/'
-            match = re.search(pattern, response.text)
-            if match:
-                fallback_imdb_id = match.group(1)
-                tqdm.write(
-                    f"{Fore.BLUE}Finished movie '{movie_name}'! Obtained IMDb ID using movie name fallback, "
-                    f"make sure to double-check later: {fallback_imdb_id}{Style.RESET_ALL}"
-                )
-                return fallback_imdb_id
+        async with await get_with_retries(session, search_url) as response:
+            if response.status == 200:
+                if lxml_html is not None:
+                    fallback_imdb_id = find_first_title_link(await response.read())
+                else:
+                    fallback_imdb_id = await search_response_body(response, _IMDB_TITLE_HREF)
+                if fallback_imdb_id:
+                    write(
+                        f"{Fore.BLUE}Finished movie '{movie_name}'! Obtained IMDb ID using movie name fallback, "
+                        f"make sure to double-check later: {fallback_imdb_id}{Style.RESET_ALL}"
+                    )
+                    return fallback_imdb_id
+                else:
+                    write(f"{Fore.RED}No search results for '{movie_name}'{Style.RESET_ALL}")
+                    return None
             else:
-                tqdm.write(f"{Fore.RED}No search results for '{movie_name}'{Style.RESET_ALL}")
+                write(
+                    f"{Fore.RED}Failed to retrieve IMDB search results for '{movie_name}' "
+                    f"(status code {response.status}){Style.RESET_ALL}"
+                )
                 return None
-        else:
-            tqdm.write(
-                f"{Fore.RED}Failed to retrieve IMDB search results for '{movie_name}' "
-                f"(status code {response.status_code}){Style.RESET_ALL}"
-            )
-            return None
-    except requests.RequestException as e:
-        tqdm.write(
-            f"{Fore.RED}Error while searching IMDB for '{movie_name}': {e}{Style.RESET_ALL}"
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        write(
+            f"{Fore.RED}Error while searching IMDB for '{movie_name}': {e!r}{Style.RESET_ALL}"
         )
         return None
 
@@ -105,116 +320,258 @@ def convert_created_at_to_watched_at(created_at_str):
     """
     Convert the 'created_at' timestamp (e.g., '2020-09-21 02:17:20')
     to the 'watched_at' format (e.g., '2024-01-12T02:00:00Z').
+    Both formats have the same digits in the same places, so this is a plain string rewrite.
     """
-    dt = datetime.strptime(created_at_str, '%Y-%m-%d %H:%M:%S')
-    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+    if not _CREATED_AT.fullmatch(created_at_str):
+        raise ValueError(f"created_at '{created_at_str}' does not match format 'YYYY-MM-DD HH:MM:SS'")
+    return created_at_str[:10] + 'T' + created_at_str[11:19] + 'Z'
 
 
-def add_imdb_ids_to_movies(input_file='metadata.json', output_file='import_data_for_trakt.json'):
+async def fetch_one(movie, session, cache, tvtime_semaphore, imdb_semaphore):
     """
-    Reads JSON, finds/fetches IMDb IDs, and writes final data to 'output_file'.
-    Format of each output entry: {"id": "tt#####", "watched_at": "YYYY-MM-DDTHH:MM:SSZ"}
+    Fetches the IMDb ID for a single 'movie' (see filter_watched_movies()), first from its TVTime page and,
+    if that fails, via the IMDb search fallback. Both lookups consult 'cache' (see load_cache())
+    first and store successful results in it. 'tvtime_semaphore' and 'imdb_semaphore' limit how many
+    requests go to each of the two hosts at once.
+    Runs concurrently with other fetches, so nothing is printed here. Instead, all messages are
+    collected and returned, to be written in the order the movies finish.
+    Returns a tuple (movie, imdb_id, tvtime_failed, log); imdb_id is None if nothing was found.
     """
-    # Read the metadata JSON file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    uuid, movie_name, _ = movie
+    log = []
+
+    cached_imdb_id = cache["tvtime"].get(uuid)
+    if cached_imdb_id:
+        return movie, cached_imdb_id, False, log
+
+    # Try fetching the IMDb ID from TVTime
+    imdb_id = None
+    url = TVTIME_MOVIE_PREFIX + uuid
+    try:
+        async with tvtime_semaphore:
+            async with await get_with_retries(session, url) as response:
+                if response.status == 200:
+                    imdb_id = await search_response_body(response, _IMDB_ID_BYTES)
+                else:
+                    log.append(
+                        f"{Fore.LIGHTYELLOW_EX}Failed to retrieve page for UUID: {uuid} "
+                        f"(status code {response.status}){Style.RESET_ALL}"
+                    )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        log.append(
+            f"{Fore.LIGHTYELLOW_EX}Error retrieving page for UUID: {uuid} -> {e!r}{Style.RESET_ALL}"
+        )
+
+    if imdb_id:
+        cache["tvtime"][uuid] = imdb_id
+
+    # If we couldn't find IMDb ID on TVTime, do fallback by searching IMDb
+    tvtime_failed = (imdb_id is None)
+    if not imdb_id:
+        search_key = movie_name.lower()
+        imdb_id = cache["search"].get(search_key)
+        if not imdb_id:
+            async with imdb_semaphore:
+                imdb_id = await get_imdb_id_by_search(movie_name, session=session, log=log)
+            if imdb_id:
+                cache["search"][search_key] = imdb_id
+
+    return movie, imdb_id, tvtime_failed, log
 
-    total_entries = len(data)
-    watched_movies = []
+
+def log_skipped_entry(entity_type, uuid, movie_name):
+    """
+    Logs why the entry with the given values isn't imported: either it's not a movie,
+    or it's a movie that wasn't watched.
+    """
+    if entity_type != 'movie':
+        tqdm.write(
+            f"{Fore.LIGHTYELLOW_EX}Skipped non-movie entry '{movie_name}' "
+            f"(entity_type: {entity_type}, UUID: {uuid}){Style.RESET_ALL}"
+        )
+    else:
+        tqdm.write(
+            f"{Fore.LIGHTYELLOW_EX}Skipped unwatched movie '{movie_name}' "
+            f"because type-uuid-n doesn't start with 'watch-' (UUID: {uuid}){Style.RESET_ALL}"
+        )
+
+
+def filter_watched_movies(entries):
+    """
+    Returns the watched movies among 'entries' as a list of (uuid, movie_name, created_at) tuples,
+    logging every skipped entry. Done before any fetching so that no HTTP work is scheduled
+    for skipped rows, and so the rest of the script doesn't have to look up the row dicts again.
+    """
+    movie_entries = []
+    for entry in entries:
+        entity_type = entry.get('entity_type') or ''
+        uuid = entry.get('uuid') or ''
+        movie_name = entry.get('movie_name') or '(no title)'
+        type_uuid_n = entry.get('type-uuid-n') or ''
+
+        # Skip if it's not a movie or if 'type-uuid-n' does NOT start with "watch-"
+        if entity_type != 'movie' or not type_uuid_n.startswith("watch-"):
+            log_skipped_entry(entity_type, uuid, movie_name)
+            continue
+
+        movie_entries.append((uuid, movie_name, entry.get('created_at') or ''))
+
+    return movie_entries
+
+
+def read_watched_movies_with_pandas(csv_file_path):
+    """
+    Same as filter_watched_movies(iter_csv_rows(csv_file_path)), but parses the CSV file with
+    pandas' C engine and filters the rows column-wise. Only used if pandas is installed.
+    Like the csv module path, missing columns are treated as empty instead of being an error.
+    """
+    try:
+        df = pd.read_csv(
+            csv_file_path,
+            usecols=lambda column: column in CSV_COLUMNS,
+            dtype=str,
+            keep_default_na=False,
+            engine='c',
+            encoding='utf-8-sig'
+        )
+    except FileNotFoundError:
+        print(f"Error: CSV file '{csv_file_path}' does not exist.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading CSV file: {e}")
+        sys.exit(1)
+
+    for column in CSV_COLUMNS:
+        if column not in df.columns:
+            df[column] = ''
+    df['movie_name'] = df['movie_name'].replace('', '(no title)')
+    watched = (df['entity_type'] == 'movie') & df['type-uuid-n'].str.startswith('watch-')
+
+    skipped = df[~watched]
+    for entity_type, uuid, movie_name in zip(skipped['entity_type'], skipped['uuid'], skipped['movie_name']):
+        log_skipped_entry(entity_type, uuid, movie_name)
+
+    movies = df[watched]
+    return list(zip(movies['uuid'], movies['movie_name'], movies['created_at']))
+
+
+def read_watched_movies(csv_file_path):
+    """
+    Reads the TV Time CSV file and returns its watched movies as a list of
+    (uuid, movie_name, created_at) tuples, using pandas if it's installed.
+    """
+    if pd is not None:
+        return read_watched_movies_with_pandas(csv_file_path)
+    return filter_watched_movies(iter_csv_rows(csv_file_path))
+
+
+async def process_movies(movie_entries, cache, output):
+    """
+    Fetches the IMDb IDs of all 'movie_entries' (see filter_watched_movies()) concurrently
+    (at most MAX_CONCURRENT_TVTIME_FETCHES TVTime pages and MAX_CONCURRENT_IMDB_SEARCHES IMDb searches
+    at once) and handles each movie as soon as it's finished.
+    Every watched movie is written to the binary file 'output' right away, as an element of
+    a JSON array, so they don't have to be kept in memory.
+    Returns a tuple (watched_count, missing_imdb_ids, fallback_obtained).
+    """
+    watched_count = 0
 
     # Keep track of movies that ended with no IMDb ID
     missing_imdb_ids = []
     # Keep track of any movies that were successfully handled by fallback
     fallback_obtained = []
 
-    with tqdm(
-        total=total_entries,
-        desc=f"{Fore.MAGENTA}Processing entries{Style.RESET_ALL}",
-        bar_format=f"{Fore.MAGENTA}{{l_bar}}{{bar}}{{r_bar}}{Style.RESET_ALL}",
-        ncols=80
-    ) as pbar:
-        for entry in data:
-            entity_type = entry.get('entity_type', '')
-            uuid = entry.get('uuid', '')
-            movie_name = entry.get('movie_name', '(no title)')
-            type_uuid_n = entry.get('type-uuid-n', '')
-            created_at = entry.get('created_at', '')
-
-            # 1) Skip if it's not a movie
-            if entity_type != 'movie':
-                tqdm.write(
-                    f"{Fore.LIGHTYELLOW_EX}Skipped non-movie entry '{movie_name}' "
-                    f"(entity_type: {entity_type}, UUID: {uuid}){Style.RESET_ALL}"
-                )
-                pbar.update(1)
-                continue
-
-            # 2) Skip if 'type-uuid-n' does NOT start with "watch-"
-            if not type_uuid_n.startswith("watch-"):
-                tqdm.write(
-                    f"{Fore.LIGHTYELLOW_EX}Skipped unwatched movie '{movie_name}' "
-                    f"because type-uuid-n doesn't start with 'watch-' (UUID: {uuid}){Style.RESET_ALL}"
-                )
-                pbar.update(1)
-                continue
-
-            # Try fetching the IMDb ID from TVTime
-            imdb_id = None
-            url = f"https://www.tvtime.com/movie/{uuid}"
-            try:
-                response = requests.get(url, timeout=10, headers=HEADERS)
-                if response.status_code == 200:
-                    imdb_id = get_first_imdb_id(response.text)
-                else:
-                    tqdm.write(
-                        f"{Fore.LIGHTYELLOW_EX}Failed to retrieve page for UUID: {uuid} "
-                        f"(status code {response.status_code}){Style.RESET_ALL}"
+    tvtime_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TVTIME_FETCHES)
+    imdb_semaphore = asyncio.Semaphore(MAX_CONCURRENT_IMDB_SEARCHES)
+
+    # One pooled session for all TVTime and IMDb requests
+    async with create_session() as session:
+        with tqdm(
+            total=len(movie_entries),
+            desc=f"{Fore.MAGENTA}Processing movies{Style.RESET_ALL}",
+            bar_format=f"{Fore.MAGENTA}{{l_bar}}{{bar}}{{r_bar}}{Style.RESET_ALL}",
+            ncols=80
+        ) as pbar:
+            output.write(b'[')
+            tasks = [fetch_one(movie, session, cache, tvtime_semaphore, imdb_semaphore)
+                     for movie in movie_entries]
+            for next_finished in asyncio.as_completed(tasks):
+                (uuid, movie_name, created_at), imdb_id, tvtime_failed, log = await next_finished
+
+                if imdb_id:
+                    # If this was obtained by fallback (i.e. TVTime failed), store detailed info
+                    if tvtime_failed:
+                        fallback_obtained.append({
+                            "movie_name": movie_name,
+                            "imdb_id": imdb_id,
+                            "uuid": uuid
+                        })
+
+                    watched_at = convert_created_at_to_watched_at(created_at)
+                    watched_movie = dumps_json({
+                        "id": imdb_id,
+                        "watched_at": watched_at
+                    }, indent=True)
+                    # Indent the object by one more level, so the file looks like a regular indented JSON array
+                    output.write(b',\n  ' if watched_count else b'\n  ')
+                    output.write(watched_movie.replace(b'\n', b'\n  '))
+                    watched_count += 1
+                    log.append(
+                        f"{Fore.LIGHTGREEN_EX}Finished movie '{movie_name}' (UUID: {uuid}){Style.RESET_ALL}"
                     )
-            except requests.RequestException as e:
-                tqdm.write(
-                    f"{Fore.LIGHTYELLOW_EX}Error retrieving page for UUID: {uuid} -> {e}{Style.RESET_ALL}"
-                )
-
-            # If we couldn't find IMDb ID on TVTime, do fallback by searching IMDb
-            tvtime_failed = (imdb_id is None)
-            if not imdb_id:
-                imdb_id = get_imdb_id_by_search(movie_name)
-
-            if imdb_id:
-                # If this was obtained by fallback (i.e. TVTime failed), store detailed info
-                if tvtime_failed:
-                    fallback_obtained.append({
+                else:
+                    # Store enough info to print in the same format
+                    missing_imdb_ids.append({
                         "movie_name": movie_name,
-                        "imdb_id": imdb_id,
                         "uuid": uuid
                     })
+                    log.append(
+                        f"{Fore.RED}Finished movie '{movie_name}' but no IMDb ID found (UUID: {uuid}){Style.RESET_ALL}"
+                    )
+
+                # One write per movie
+                tqdm.write("\n".join(log))
+                pbar.update(1)
+
+            output.write(b'\n]' if watched_count else b']')
+
+    return watched_count, missing_imdb_ids, fallback_obtained
 
-                watched_at = convert_created_at_to_watched_at(created_at)
-                watched_movies.append({
-                    "id": imdb_id,
-                    "watched_at": watched_at
-                })
-                tqdm.write(
-                    f"{Fore.LIGHTGREEN_EX}Finished movie '{movie_name}' (UUID: {uuid}){Style.RESET_ALL}"
-                )
-            else:
-                # Store enough info to print in the same format
-                missing_imdb_ids.append({
-                    "movie_name": movie_name,
-                    "uuid": uuid
-                })
-                tqdm.write(
-                    f"{Fore.RED}Finished movie '{movie_name}' but no IMDb ID found (UUID: {uuid}){Style.RESET_ALL}"
-                )
 
-            pbar.update(1)
+def add_imdb_ids_to_movies(movie_entries, output_file='import_data_for_trakt.json', cache_file=CACHE_FILE):
+    """
+    Finds/fetches IMDb IDs for 'movie_entries' (as returned by read_watched_movies()),
+    and writes final data to 'output_file'.
+    IMDb IDs are cached in 'cache_file' across runs.
+    Format of each output entry: {"id": "tt#####", "watched_at": "YYYY-MM-DDTHH:MM:SSZ"}
+    The per-movie HTTP fetches run concurrently on an asyncio event loop (see process_movies()).
+    """
+    cache = load_cache(cache_file)
+
+    # Only the watched-movies data is saved. It's streamed into a temp file next to 'output_file',
+    # which only replaces 'output_file' once every movie was processed, so a failed or interrupted
+    # run never leaves a truncated file behind (and keeps the output of the last successful run).
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix=".import_data_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            watched_count, missing_imdb_ids, fallback_obtained = asyncio.run(
+                process_movies(movie_entries, cache, output)
+            )
+        os.replace(temp_path, output_file)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    finally:
+        # Save what we found so far, even if the run was interrupted
+        save_cache(cache, cache_file)
 
     # Print missing IDs if any (in the same style as fallback)
     if missing_imdb_ids:
         print("\nCould not find IMDb ID (even via fallback search) for these entries:")
         for item in missing_imdb_ids:
             print(
-                f"  {item['movie_name']} => no_id => https://www.tvtime.com/movie/{item['uuid']}"
+                f"  {item['movie_name']} => no_id => {TVTIME_MOVIE_PREFIX}{item['uuid']}"
             )
 
     # Also print fallback successes, now including IMDb link
@@ -223,33 +580,24 @@ def add_imdb_ids_to_movies(input_file='metadata.json', output_file='import_data_
         for item in fallback_obtained:
             print(
                 f"  {item['movie_name']} => {item['imdb_id']} => "
-                f"https://www.tvtime.com/movie/{item['uuid']} => "
-                f"https://www.imdb.com/title/{item['imdb_id']}"
+                f"{TVTIME_MOVIE_PREFIX}{item['uuid']} => "
+                f"{IMDB_TITLE_PREFIX}{item['imdb_id']}"
             )
 
-    # Save only the watched-movies data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(watched_movies, f, indent=2, ensure_ascii=False)
-
-    print(f"\nAdded {len(watched_movies)} watched movies to '{output_file}'.")
+    print(f"\nAdded {watched_count} watched movies to '{output_file}'.")
 
 
 def main():
     """
-    1. Convert the CSV file ('tracking-prod-records.csv') to a temporary JSON ('temp_metadata.json').
-    2. Process that JSON to gather IMDb IDs.
+    1. Read the watched movies from the CSV file ('tracking-prod-records.csv').
+    2. Process those movies to gather IMDb IDs.
     3. Write the final output to 'import_data_for_trakt.json'.
     """
     csv_file = "tracking-prod-records.csv"
-    temp_json_file = "temp_metadata.json"
     final_output_file = "import_data_for_trakt.json"
 
-    # 1) Convert CSV -> JSON
-    csv_to_json(csv_file_path=csv_file, json_file_path=temp_json_file)
-
-    # 2) Process the JSON and output final
     add_imdb_ids_to_movies(
-        input_file=temp_json_file,
+        movie_entries=read_watched_movies(csv_file),
         output_file=final_output_file
     )
 